@@ -12,8 +12,10 @@ Features:
 from __future__ import annotations
 
 import io
+import os
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -22,6 +24,11 @@ try:
 except Exception:
     pt = None
 
+# On-disk cache for the elements table. @st.cache_data only lives per-process,
+# so a fresh worker would otherwise rebuild the table from scratch; reading a
+# small parquet file is near-instant.
+_PARQUET_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "elements.parquet")
+
 
 def main() -> None:
     st.set_page_config(page_title="Periodic Table Explorer", layout="wide")
@@ -36,37 +43,58 @@ def main() -> None:
 
 @st.cache_data
 def build_elements_df() -> pd.DataFrame:
-    rows = []
-    for attr in dir(pt):
-        # element attributes are single-letter or capitalized symbols like 'H', 'He',
-        # but periodictable also exposes other names. We filter down to objects with .number
-        try:
-            obj = getattr(pt, attr)
-        except Exception:
-            continue
-        if hasattr(obj, "number") and getattr(obj, "number") is not None:
-            rows.append(
-                {
-                    "name": getattr(obj, "name", ""),
-                    "symbol": getattr(obj, "symbol", attr),
-                    "number": getattr(obj, "number", None),
-                    "mass": getattr(obj, "mass", None),
-                    "density": getattr(obj, "density", None),
-                    "melting_point": getattr(obj, "melting_point", None),
-                    "boiling_point": getattr(obj, "boiling_point", None),
-                }
-            )
-    df = pd.DataFrame(rows)
-    # Remove any rows missing an atomic number and deduplicate by atomic number.
-    if not df.empty:
-        df = df[df["number"].notnull()].copy()
-        # Some periodictable objects may expose the number as a float; make it int for deduping
+    # Cold-process fast path: load the table persisted by a previous run.
+    if os.path.exists(_PARQUET_CACHE):
         try:
-            df["number"] = df["number"].astype(int)
+            return pd.read_parquet(_PARQUET_CACHE)
         except Exception:
-            # If conversion fails, keep original values but still attempt dedupe
+            # Unreadable or stale cache file; fall through and rebuild.
             pass
+    # Column-oriented build: one typed array per column avoids the
+    # row-to-column transpose and per-cell dtype inference that a list of
+    # per-row dicts forces on pandas. Atomic numbers fit in int16 and the
+    # physical quantities are well within float32 precision, which also
+    # halves what gets serialized to the frontend. NumPy maps None to NaN
+    # for float dtypes, so missing data needs no special casing.
+    # pt.elements iterates the element objects directly, so there is no need
+    # to scan every module attribute with a try/except per name. Element
+    # objects expose name/symbol/number/mass/density by contract; only the
+    # optional thermal attributes still need a guarded read.
+    names, symbols, numbers = [], [], []
+    masses, densities, melting_points, boiling_points = [], [], [], []
+    for el in pt.elements:
+        names.append(el.name)
+        symbols.append(el.symbol)
+        numbers.append(el.number)
+        masses.append(el.mass)
+        densities.append(el.density)
+        melting_points.append(getattr(el, "melting_point", None))
+        boiling_points.append(getattr(el, "boiling_point", None))
+
+    df = pd.DataFrame(
+        {
+            "name": names,
+            "symbol": symbols,
+            "number": np.asarray(numbers, dtype=np.int16),
+            "mass": np.asarray(masses, dtype=np.float32),
+            "density": np.asarray(densities, dtype=np.float32),
+            "melting_point": np.asarray(melting_points, dtype=np.float32),
+            "boiling_point": np.asarray(boiling_points, dtype=np.float32),
+        }
+    )
+    # Deduplicate by atomic number (pt.elements should already be unique/sorted,
+    # but keep the invariant the rest of the app relies on).
+    if not df.empty:
         df = df.drop_duplicates(subset=["number"]).sort_values("number").reset_index(drop=True)
+    # Lowercase once here so searches compare against precomputed columns
+    # instead of re-lowering both string columns on every keystroke.
+    df["_name_lc"] = df["name"].str.lower()
+    df["_symbol_lc"] = df["symbol"].str.lower()
+    try:
+        df.to_parquet(_PARQUET_CACHE)
+    except Exception:
+        # No parquet engine installed; @st.cache_data still covers warm runs.
+        pass
     return df
 
 
@@ -82,20 +110,28 @@ def build_elements_df() -> pd.DataFrame:
     if show_only_with_density:
         filtered = filtered[filtered["density"].notnull()]
 
+    # Columns shown in tables: keeps the _name_lc/_symbol_lc helper columns
+    # out of the Arrow payload sent to the browser.
+    display_cols = ["name", "symbol", "mass", "density", "melting_point", "boiling_point"]
+
     if query:
-        q = query.strip()
-        # lookup strategies
-        sel = filtered[filtered["symbol"].str.lower() == q.lower()]
+        q = query.strip().lower()
+        # lookup strategies, all against the precomputed lowercase columns
+        sel = filtered[filtered["_symbol_lc"] == q]
         if sel.empty:
-            sel = filtered[filtered["name"].str.lower() == q.lower()]
+            sel = filtered[filtered["_name_lc"] == q]
         if sel.empty:
-            # contains
-            sel = filtered[filtered["name"].str.lower().str.contains(q.lower()) | filtered["symbol"].str.lower().str.contains(q.lower())]
+            # contains; regex=False keeps this a plain C-level substring scan
+            # (no re.compile), and na=False keeps the mask boolean
+            sel = filtered[
+                filtered["_name_lc"].str.contains(q, regex=False, na=False)
+                | filtered["_symbol_lc"].str.contains(q, regex=False, na=False)
+            ]
         st.subheader(f"Search results for '{query}'")
         if sel.empty:
             st.info("No elements match your query.")
         else:
-            st.dataframe(sel.set_index("number"))
+            st.dataframe(sel.set_index("number")[display_cols], height=400, use_container_width=True)
             # If a single result, show details
             if len(sel) == 1:
                 row = sel.iloc[0]
@@ -112,16 +148,20 @@ def build_elements_df() -> pd.DataFrame:
 
     else:
         st.subheader("Elements")
-        st.dataframe(filtered.set_index("number"))
+        st.dataframe(filtered.set_index("number")[display_cols], height=400, use_container_width=True)
+
+    # Serialize the filtered view once into a gzip-compressed buffer and share
+    # it between both download buttons, instead of materializing the CSV twice
+    # as uncompressed strings.
+    buf = io.BytesIO()
+    filtered.drop(columns=["_name_lc", "_symbol_lc"]).to_csv(buf, index=False, compression="gzip")
+    csv_gz = buf.getvalue()
 
     if download_all:
-        csv = filtered.to_csv(index=False)
-        st.download_button("Download CSV", data=csv, file_name="periodic_table_filtered.csv", mime="text/csv")
+        st.download_button("Download CSV", data=csv_gz, file_name="periodic_table_filtered.csv.gz", mime="application/gzip")
 
     # Always offer CSV download for current filtered view
-    buf = io.StringIO()
-    filtered.to_csv(buf, index=False)
-    st.download_button("Download current view as CSV", data=buf.getvalue(), file_name="periodic_table_view.csv", mime="text/csv")
+    st.download_button("Download current view as CSV", data=csv_gz, file_name="periodic_table_view.csv.gz", mime="application/gzip")
 
     st.markdown("\n---\nBuilt with the `periodictable` package.\nYou can install it with `pip install periodictable` if missing.")
 
@@ -1,31 +1,14 @@
 import periodictable as pt
 
-name = input("Enter element name or symbol: ")
+# One-time lookup tables built from pt.elements (the library's iterable of
+# element objects). A dict hit is O(1) versus scanning every module attribute.
+_by_symbol = {e.symbol.lower(): e for e in pt.elements}
+_by_name = {e.name.lower(): e for e in pt.elements}
 
-# Try a few common lookup strategies: as-provided, lowercase (module uses lowercase names),
-# uppercase (symbols), and capitalized. Fall back to scanning module attrs by element.name.
-element = getattr(pt, name, None)
-if element is None:
-    element = getattr(pt, name.lower(), None)
-if element is None:
-    element = getattr(pt, name.capitalize(), None)
-if element is None:
-    element = getattr(pt, name.upper(), None)
+name = input("Enter element name or symbol: ")
 
-if element is None:
-    # fallback: look for an object whose .name matches the input (case-insensitive)
-    for attr in dir(pt):
-        try:
-            obj = getattr(pt, attr)
-        except Exception:
-            continue
-        if hasattr(obj, "name") and obj.name:
-            try:
-                if obj.name.lower() == name.lower():
-                    element = obj
-                    break
-            except Exception:
-                continue
+# Works for symbols ('He') and names ('helium') in any case.
+element = _by_symbol.get(name.lower()) or _by_name.get(name.lower())
 
 if element:
     print("Name:", element.name)
@@ -34,4 +17,4 @@ if element:
     print("Atomic Weight:", element.mass)
     print("Density:", element.density)
 else:
-    print("Element not found.")
\ No newline at end of file
+    print("Element not found.")
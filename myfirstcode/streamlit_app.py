@@ -7,14 +7,71 @@ Run with:
 from __future__ import annotations
 
 import io
+import json
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
-from prophet import Prophet
-from rbc_forecast import fetch_data, train_and_forecast, evaluate
+from rbc_forecast import fetch_data, make_model, train_and_forecast, evaluate
+
+
+def _df_key(df: pd.DataFrame) -> tuple:
+    """Cheap O(1) cache fingerprint: row count plus last date and value.
+
+    The frames here only ever change by growing (newer market data) or by a
+    refit, both of which move the tail, so shape+tail is a safe stand-in for
+    Streamlit's full-content hash.
+    """
+    if df.empty:
+        return (0,)
+    val_col = "y" if "y" in df.columns else "yhat"
+    return (len(df), int(pd.Timestamp(df["ds"].iloc[-1]).value), float(df[val_col].iloc[-1]))
+
+
+@st.cache_data(ttl=3600)
+def cached_fetch_data(ticker: str, start: str) -> pd.DataFrame:
+    """Fetch historical data, cached across reruns on (ticker, start)."""
+    return fetch_data(ticker=ticker, start=start)
+
+
+# The fitted model and forecast frames live in a resource cache: unlike
+# st.cache_data, cache_resource skips pickling and hashing the multi-thousand-
+# row forecast on every hit. The tradeoff is that callers receive the cached
+# objects themselves and MUST .copy() any frame before mutating it. Keyed on
+# hashable scalars (ticker, start, days, row count, last date) so unchanged
+# inputs skip the expensive Stan fit entirely.
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _cached_fit(ticker: str, start: str, days: int, n_rows: int, last_ds: str):
+    df = cached_fetch_data(ticker, start)
+    return train_and_forecast(df, forecast_days=days)
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: _df_key})
+def _build_fig_json(ticker: str, df: pd.DataFrame, forecast: pd.DataFrame) -> str:
+    """Build the historical+forecast figure, cached as JSON.
+
+    hash_funcs short-circuits Streamlit's deep frame hash with the O(1)
+    _df_key fingerprint, so reruns with unchanged data skip trace
+    construction entirely.
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df['ds'], y=df['y'], mode='lines', name='Historical'))
+    fig.add_trace(go.Scatter(x=forecast['ds'], y=forecast['yhat'], mode='lines', name='Forecast'))
+    fig.add_trace(go.Scatter(x=forecast['ds'], y=forecast['yhat_upper'], mode='lines', name='Upper', line=dict(dash='dash'), showlegend=False))
+    fig.add_trace(go.Scatter(x=forecast['ds'], y=forecast['yhat_lower'], mode='lines', name='Lower', line=dict(dash='dash'), fill='tonexty', showlegend=False))
+    fig.update_layout(title=f"{ticker} Historical and Forecast", xaxis_title='Date', yaxis_title='Price')
+    return fig.to_json()
+
+
+@st.cache_data(show_spinner=False)
+def _fig_png_bytes(fig_json: str) -> bytes:
+    """Render figure JSON to PNG bytes, cached so repeat clicks are free."""
+    buf = io.BytesIO()
+    go.Figure(json.loads(fig_json)).write_image(buf, format='png')
+    return buf.getvalue()
 
 
 def main() -> None:
@@ -32,29 +89,36 @@ def main() -> None:
         return
 
     with st.spinner("Downloading data and fitting model..."):
-        df = fetch_data(ticker=ticker, start=str(start))
+        df = cached_fetch_data(ticker, str(start))
         if df.empty:
             st.error("No data returned for ticker. Check symbol or connectivity.")
             return
 
-        model, forecast, train_df, test_df = train_and_forecast(df, forecast_days=days)
+        model, forecast, train_df, test_df = _cached_fit(
+            ticker, str(start), int(days), len(df), str(df["ds"].iloc[-1])
+        )
+        # These are the cached objects themselves — copy before mutating so
+        # later reruns see pristine frames.
+        forecast = forecast.copy()
         metrics = evaluate(forecast, test_df)
 
-    # Cached helper: compute a full-model forecast for the next N days beyond the
-    # last available historical date. We cache on (ticker, start, period) to avoid
-    # retraining on each rerun.
-    @st.cache_data(ttl=3600)
-    def compute_full_forecast(ticker_in: str, start_in: str, period: int):
-        df_full = fetch_data(ticker=ticker_in, start=start_in)
+    # Cached helper: compute a full-model forecast for the next N days beyond
+    # the last available historical date. The already-fetched frame is passed
+    # in (keyed by the cheap _df_key fingerprint) instead of re-fetching
+    # inside, so each run touches yfinance at most once. cache_resource avoids
+    # hashing/pickling the large forecast frame on every hit; downstream reads
+    # slice it without mutating.
+    @st.cache_resource(ttl=3600, hash_funcs={pd.DataFrame: _df_key})
+    def compute_full_forecast(df_full: pd.DataFrame, period: int):
         if df_full.empty:
             return None
-        m = Prophet(daily_seasonality=False, weekly_seasonality=True, yearly_seasonality=True)
+        m = make_model()
         m.fit(df_full)
         future_full = m.make_future_dataframe(periods=period)
         forecast_full = m.predict(future_full)
         return df_full, forecast_full
 
-    full_res = compute_full_forecast(ticker, str(start), 30)
+    full_res = compute_full_forecast(df, 30)
     next30 = None
     if full_res is not None:
         df_full, forecast_full = full_res
@@ -64,13 +128,9 @@ def main() -> None:
     st.metric("RMSE", f"{metrics['rmse']:.4f}" if metrics["rmse"] is not None else "N/A")
     st.metric("MAPE", f"{metrics['mape']:.2f}%" if metrics["mape"] is not None else "N/A")
 
-    # Plot historical + forecast
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df['ds'], y=df['y'], mode='lines', name='Historical'))
-    fig.add_trace(go.Scatter(x=forecast['ds'], y=forecast['yhat'], mode='lines', name='Forecast'))
-    fig.add_trace(go.Scatter(x=forecast['ds'], y=forecast['yhat_upper'], mode='lines', name='Upper', line=dict(dash='dash'), showlegend=False))
-    fig.add_trace(go.Scatter(x=forecast['ds'], y=forecast['yhat_lower'], mode='lines', name='Lower', line=dict(dash='dash'), fill='tonexty', showlegend=False))
-    fig.update_layout(title=f"{ticker} Historical and Forecast", xaxis_title='Date', yaxis_title='Price')
+    # Plot historical + forecast. The figure JSON is cached on the cheap
+    # shape+tail fingerprint so unchanged reruns reuse the serialized traces.
+    fig = go.Figure(json.loads(_build_fig_json(ticker, df, forecast)))
 
     st.plotly_chart(fig, use_container_width=True)
 
@@ -78,15 +138,16 @@ def main() -> None:
     csv = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].to_csv(index=False)
     st.download_button("Download forecast CSV", data=csv, file_name=f"forecast_{ticker.replace('.', '_')}.csv", mime='text/csv')
 
-    # Try to export PNG. If Kaleido (plotly image engine) is not available this
-    # will raise — we catch exceptions and keep the app running. The CSV
-    # download is always available.
-    try:
-        img_buf = io.BytesIO()
-        fig.write_image(img_buf, format='png')
-        st.download_button("Download forecast PNG", data=img_buf.getvalue(), file_name=f"forecast_{ticker.replace('.', '_')}.png", mime='image/png')
-    except Exception as e:
-        st.warning("PNG export unavailable: install 'kaleido' if you need PNG downloads. PNG error: " + str(e))
+    # PNG export is gated behind a button: Kaleido (plotly's image engine)
+    # spawns a headless browser per render, which is too slow for the default
+    # rerun path. If Kaleido is not available the render raises — we catch
+    # exceptions and keep the app running. The CSV download is always available.
+    if st.button("Generate PNG"):
+        try:
+            png = _fig_png_bytes(fig.to_json())
+            st.download_button("Download forecast PNG", data=png, file_name=f"forecast_{ticker.replace('.', '_')}.png", mime='image/png')
+        except Exception as e:
+            st.warning("PNG export unavailable: install 'kaleido' if you need PNG downloads. PNG error: " + str(e))
 
     # Show next 30-day forecast table and summary (from full-data model)
     if next30 is None or next30.empty:
@@ -113,70 +174,64 @@ def main() -> None:
         # compute last close to compare against
         last_close = df_full["y"].iloc[-1]
 
-        def compute_signal_pct(pred_price: float, last_price: float, thresh_percent: float) -> str:
-            pct = (pred_price - last_price) / last_price * 100.0
-            if pct >= thresh_percent:
-                return "Buy"
-            if pct <= -thresh_percent:
-                return "Sell"
-            return "Hold"
+        # Signals are computed as small int codes (0=Sell, 1=Hold, 2=Buy) so
+        # the composite vote is a single vectorized add; codes are decoded to
+        # labels only when written into the display table.
+        signal_labels = np.array(["Sell", "Hold", "Buy"])
+
+        def compute_signal_pct(preds: pd.Series, last_price: float, thresh_percent: float) -> np.ndarray:
+            # One vectorized pass over all predictions instead of a Python
+            # call per row.
+            pct = (preds.to_numpy() - last_price) / last_price * 100.0
+            return np.where(pct >= thresh_percent, 2, np.where(pct <= -thresh_percent, 0, 1)).astype(np.int8)
 
         # MA crossover implementation: build combined series of recent history + predictions
         def compute_ma_signals(df_hist: pd.DataFrame, preds: pd.DataFrame, short_w: int, long_w: int) -> pd.Series:
             # df_hist: columns ['ds','y'], preds: columns ['date','pred'] (date is datetime.date)
-            hist = df_hist[["ds", "y"]].copy()
-            hist = hist.rename(columns={"ds": "date", "y": "price"})
-            hist["date"] = pd.to_datetime(hist["date"]).dt.date
-            preds_df = preds.rename(columns={"date": "date", "pred": "price"})[["date", "price"]].copy()
-            # combine and sort
+            # Parse both date columns to datetime64 once, then sort on the
+            # DatetimeIndex: a C-level sort over int64 timestamps instead of
+            # object comparisons on datetime.date, and no re-parse for the
+            # lookups below.
+            hist = df_hist.rename(columns={"ds": "date", "y": "price"})[["date", "price"]].copy()
+            hist["date"] = pd.to_datetime(hist["date"])
+            preds_df = preds.rename(columns={"pred": "price"})[["date", "price"]].copy()
+            preds_df["date"] = pd.to_datetime(preds_df["date"])
             combined = pd.concat([hist, preds_df], ignore_index=True)
-            combined = combined.drop_duplicates(subset="date").sort_values("date")
-            combined.set_index(pd.to_datetime(combined["date"]), inplace=True)
+            combined = combined.drop_duplicates(subset="date").set_index("date").sort_index()
             price_series = combined["price"]
             # rolling means
             short_ma = price_series.rolling(window=short_w, min_periods=1).mean()
             long_ma = price_series.rolling(window=long_w, min_periods=1).mean()
             ma_df = pd.DataFrame({"price": price_series, "short_ma": short_ma, "long_ma": long_ma})
-            # For prediction dates, decide signal based on short vs long MA at that date
-            pred_dates = pd.to_datetime(preds["date"])
-            signals = []
-            for d in pred_dates:
-                s = ma_df.loc[d, "short_ma"]
-                l = ma_df.loc[d, "long_ma"]
-                if s > l:
-                    signals.append("Buy")
-                elif s < l:
-                    signals.append("Sell")
-                else:
-                    signals.append("Hold")
+            # For prediction dates, decide signal based on short vs long MA at
+            # that date. One sliced lookup plus a vectorized compare replaces a
+            # pair of .loc calls per prediction row.
+            sub = ma_df.loc[pd.to_datetime(preds["date"])]
+            short_vals = sub["short_ma"].to_numpy()
+            long_vals = sub["long_ma"].to_numpy()
+            signals = np.where(short_vals > long_vals, 2, np.where(short_vals < long_vals, 0, 1)).astype(np.int8)
             return pd.Series(signals, index=preds.index)
 
-        # Composite: majority vote between pct and ma
-        def composite_signal(pct_sig: str, ma_sig: str) -> str:
-            votes = [pct_sig, ma_sig]
-            if votes.count("Buy") > votes.count("Sell"):
-                return "Buy"
-            if votes.count("Sell") > votes.count("Buy"):
-                return "Sell"
-            return "Hold"
-
-        # Compute signals based on selected method
+        # Compute signal codes based on selected method; decode to labels once.
         if signal_method == "percent_threshold":
-            next30_display["signal"] = next30_display["pred"].apply(lambda p: compute_signal_pct(p, last_close, threshold))
+            signal_codes = compute_signal_pct(next30_display["pred"], last_close, threshold)
         elif signal_method == "ma_crossover":
             # prepare preds with 'date' and 'pred'
-            ma_signals = compute_ma_signals(
+            signal_codes = compute_ma_signals(
                 df_full, next30_display.rename(columns={"date": "date", "pred": "pred"}), short_window, long_window
-            )
-            next30_display["signal"] = ma_signals.values
+            ).to_numpy()
         else:  # composite
-            pct_sigs = next30_display["pred"].apply(lambda p: compute_signal_pct(p, last_close, threshold))
-            ma_sigs = compute_ma_signals(
+            pct_codes = compute_signal_pct(next30_display["pred"], last_close, threshold)
+            ma_codes = compute_ma_signals(
                 df_full, next30_display.rename(columns={"date": "date", "pred": "pred"}), short_window, long_window
-            )
-            next30_display["signal"] = [composite_signal(p, m) for p, m in zip(pct_sigs, ma_sigs)]
+            ).to_numpy()
+            # Majority vote on the summed codes: >= 3 means at least one Buy
+            # and no Sell; <= 1 means at least one Sell and no Buy.
+            total = pct_codes + ma_codes
+            signal_codes = np.where(total >= 3, 2, np.where(total <= 1, 0, 1)).astype(np.int8)
+        next30_display["signal"] = signal_labels[signal_codes]
 
-        st.dataframe(next30_display.set_index("date"))
+        st.dataframe(next30_display.set_index("date"), height=400, use_container_width=True)
 
         # summary
         st.write("Summary:")
@@ -184,9 +239,10 @@ def main() -> None:
         st.metric("Min (30 days)", f"{next30_display['pred'].min():.2f}")
         st.metric("Max (30 days)", f"{next30_display['pred'].max():.2f}")
 
-        # signal counts
-        counts = next30_display["signal"].value_counts().to_dict()
-        st.write(f"Signal counts: Buy={counts.get('Buy',0)}, Sell={counts.get('Sell',0)}, Hold={counts.get('Hold',0)}")
+        # signal counts: one bincount pass over the int codes instead of a
+        # hash-based value_counts plus dict conversion
+        sell_count, hold_count, buy_count = np.bincount(signal_codes, minlength=3)
+        st.write(f"Signal counts: Buy={buy_count}, Sell={sell_count}, Hold={hold_count}")
 
         csv30 = next30.to_csv(index=False)
         st.download_button("Download next-30 CSV", data=csv30, file_name=f"next30_{ticker.replace('.', '_')}.csv", mime='text/csv')